@@ -8,27 +8,40 @@ __description__ = (
     "A Python wrapper for rsync to sync code between local and remote machines"
 )
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .config import CsyncConfig
 from .rsync import RsyncWrapper
 from .cli import main
 
-# Optional imports for extended functionality
-try:
+if TYPE_CHECKING:
     from .analyzer import analyze_project_smart
     from .daemon import start_daemon
     from .process_manager import get_process_manager
-    from .ui import configure_ui, run_ui
-
-    __all__ = [
-        "CsyncConfig",
-        "RsyncWrapper",
-        "main",
-        "analyze_project_smart",
-        "start_daemon",
-        "get_process_manager",
-        "configure_ui",
-        "run_ui",
-    ]
-except ImportError:
-    # Fallback if optional dependencies are not available
-    __all__ = ["CsyncConfig", "RsyncWrapper", "main"]
+
+# Loaded on first attribute access (PEP 562) to keep CLI startup fast
+_LAZY_IMPORTS = {
+    "analyze_project_smart": ".analyzer",
+    "start_daemon": ".daemon",
+    "get_process_manager": ".process_manager",
+}
+
+# Spelled out for static analysis; keep in sync with _LAZY_IMPORTS
+__all__ = [
+    "CsyncConfig",
+    "RsyncWrapper",
+    "main",
+    "analyze_project_smart",
+    "start_daemon",
+    "get_process_manager",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -3,19 +3,33 @@ Smart analyzer module for csync.
 Analyzes directory structure to suggest intelligent exclude patterns.
 """
 
+import heapq
 import os
-from pathlib import Path
-from typing import List, Dict, Set, Tuple, Optional
+import stat
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Iterator, List, Dict, Set, Tuple, Optional
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
+# Rich is imported where it's used to keep `import csync` cheap
+if TYPE_CHECKING:
+    from rich.console import Console
 
+# Optional Rust traversal backend: pip install 'csync[fast-scan]'
+try:
+    import scandir_rs as _fast_walk
+except ImportError:
+    _fast_walk = None
 
-@dataclass
+# (filename, size in bytes or None if it couldn't be read)
+FileSizes = List[Tuple[str, Optional[int]]]
+# (depth, dirpath, rel_path, files) for each directory visited by a walker
+DirWalk = Iterator[Tuple[int, str, str, FileSizes]]
+
+
+@dataclass(slots=True, frozen=True)
 class DirectoryStats:
     """Statistics about a directory."""
 
@@ -24,11 +38,11 @@ class DirectoryStats:
     total_size: int  # in bytes
     max_file_size: int
     avg_file_size: float
-    extensions: Dict[str, int]  # extension -> count
+    extensions: Tuple[Tuple[str, int], ...]  # (extension, count) pairs
     depth: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     """Result of directory analysis."""
 
@@ -46,6 +60,7 @@ class SmartAnalyzer:
     MAX_FILE_SIZE_MB = 50
     MAX_DIRECTORY_FILES = 1000
     MAX_DIRECTORY_SIZE_MB = 500
+    PROGRESS_INTERVAL = 0.05  # seconds between progress redraws
 
     # Known problematic patterns
     KNOWN_EXCLUDES = {
@@ -105,8 +120,36 @@ class SmartAnalyzer:
         "*.sqlite3",
     }
 
-    def __init__(self, console: Optional[Console] = None):
-        self.console = console or Console()
+    # Extensions whose presence alone is worth an exclude suggestion. Only the
+    # last suffix is seen, so .tar.gz is left to KNOWN_EXCLUDES ("*.tar.gz")
+    _LARGE_EXT_SET = frozenset({".mp4", ".avi", ".mov", ".zip", ".dmg", ".iso"})
+
+    BACKENDS = ("auto", "python", "fast")
+
+    def __init__(self, console: Optional["Console"] = None, backend: str = "auto"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown analyzer backend: {backend}")
+        if backend == "fast" and _fast_walk is None:
+            raise ImportError(
+                "The fast analyzer backend requires scandir-rs: "
+                "pip install 'csync[fast-scan]'"
+            )
+        self.use_fast_walk = backend == "fast" or (
+            backend == "auto" and _fast_walk is not None
+        )
+
+        if console is None:
+            from rich.console import Console
+
+            console = Console()
+        self.console = console
+        # Size thresholds in bytes (MB << 20), computed once
+        self._max_file_bytes = self.MAX_FILE_SIZE_MB << 20
+        self._max_dir_bytes = self.MAX_DIRECTORY_SIZE_MB << 20
+        # Directory names that are pruned during traversal
+        self._excluded_dirnames = frozenset(
+            p.rstrip("/").lower() for p in self.KNOWN_EXCLUDES if "*" not in p
+        )
 
     def analyze_directory(self, root_path: str, max_depth: int = 3) -> AnalysisResult:
         """
@@ -119,7 +162,9 @@ class SmartAnalyzer:
         Returns:
             AnalysisResult with suggestions and statistics
         """
-        root_path_obj = Path(root_path).resolve()
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
+        root_str = os.path.realpath(root_path)
 
         with Progress(
             SpinnerColumn(),
@@ -127,56 +172,63 @@ class SmartAnalyzer:
             console=self.console,
         ) as progress:
             task = progress.add_task("🔍 Analyzing project structure...", total=None)
+            progress_lock = threading.Lock()
+            last_update = 0.0
+
+            def report(rel_path: str) -> None:
+                # Throttle redraws; most directories finish in microseconds
+                nonlocal last_update
+                with progress_lock:
+                    now = time.monotonic()
+                    if now - last_update > self.PROGRESS_INTERVAL:
+                        last_update = now
+                        description = f"🔍 Analyzing {rel_path}..."
+                        progress.update(task, description=description)
 
             # Scan directory structure
             stats = {}
             large_files = []
             large_directories = []
             problematic_patterns = set()
-
-            for dirpath, dirnames, filenames in os.walk(root_path_obj):
-                rel_path = os.path.relpath(dirpath, root_path_obj)
-                depth = len(rel_path.split(os.sep)) if rel_path != "." else 0
-
-                if depth > max_depth:
-                    continue
-
-                progress.update(task, description=f"🔍 Analyzing {rel_path}...")
-
-                # Analyze current directory
-                dir_stats = self._analyze_single_directory(dirpath, filenames)
-                stats[rel_path] = dir_stats
-
-                # Check for large files
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        size = os.path.getsize(filepath)
-                        if size > self.MAX_FILE_SIZE_MB * 1024 * 1024:
-                            rel_filepath = os.path.relpath(filepath, root_path_obj)
-                            large_files.append((rel_filepath, size // (1024 * 1024)))
-                    except (OSError, IOError):
-                        continue
-
-                # Check for large directories
-                if (
-                    dir_stats.file_count > self.MAX_DIRECTORY_FILES
-                    or dir_stats.total_size > self.MAX_DIRECTORY_SIZE_MB * 1024 * 1024
-                ):
-                    size_mb = dir_stats.total_size // (1024 * 1024)
-                    large_directories.append((rel_path, dir_stats.file_count, size_mb))
-
-                # Check for known problematic patterns
-                dir_name = os.path.basename(dirpath)
-                if dir_name.lower() in [
-                    p.lower().rstrip("*") for p in self.KNOWN_EXCLUDES
-                ]:
-                    if rel_path != ".":  # Don't exclude root
-                        problematic_patterns.add(f"{rel_path}/")
+            seen_large_exts = set()
+            pruned_dirs = []  # relative paths, appended to by worker threads
+
+            # The root is analyzed here; each top-level subtree goes to a worker.
+            # scandir/stat release the GIL, so the walks overlap their I/O.
+            # scandir-rs parallelizes internally and is consumed as one walk.
+            walks = []
+            if self.use_fast_walk:
+                walks.append(self._fast_walk(root_str, max_depth, pruned_dirs))
+            elif (scan := self._scan_directory(root_str)) is not None:
+                files, subdirs = scan
+                walks.append(iter([(0, root_str, ".", files)]))
+                if max_depth > 0:
+                    for entry in self._descend(subdirs, ".", pruned_dirs):
+                        walk = self._scandir_walk(
+                            entry.path, entry.name, max_depth, pruned_dirs, 1
+                        )
+                        walks.append(walk)
+
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(self._analyze_subtree, walk, report)
+                    for walk in walks
+                ]
+                # Merge in submission order to keep the output deterministic
+                for future in futures:
+                    sub_stats, sub_files, sub_dirs, sub_exts = future.result()
+                    stats.update(sub_stats)
+                    large_files.extend(sub_files)
+                    large_directories.extend(sub_dirs)
+                    seen_large_exts.update(sub_exts)
+
+            # Known problematic directories are pruned without being scanned
+            problematic_patterns.update(f"{rel_path}/" for rel_path in pruned_dirs)
 
         # Generate suggestions
         suggested_excludes = self._generate_suggestions(
-            stats, large_files, large_directories, problematic_patterns
+            large_files, large_directories, problematic_patterns, seen_large_exts
         )
 
         return AnalysisResult(
@@ -187,49 +239,219 @@ class SmartAnalyzer:
             statistics=stats,
         )
 
-    def _analyze_single_directory(
-        self, dirpath: str, filenames: List[str]
-    ) -> DirectoryStats:
-        """Analyze a single directory and return statistics."""
-        total_size = 0
-        max_file_size = 0
-        extensions = defaultdict(int)
-
-        for filename in filenames:
-            filepath = os.path.join(dirpath, filename)
-            try:
-                size = os.path.getsize(filepath)
-                total_size += size
-                max_file_size = max(max_file_size, size)
-
-                # Track file extensions
-                ext = Path(filename).suffix.lower()
-                if ext:
-                    extensions[ext] += 1
-                else:
-                    extensions["<no extension>"] += 1
+    def _analyze_subtree(
+        self,
+        walk: DirWalk,
+        report: Callable[[str], None],
+    ) -> Tuple[
+        Dict[str, DirectoryStats],
+        List[Tuple[str, int]],
+        List[Tuple[str, int, int]],
+        Set[str],
+    ]:
+        """Analyze every directory produced by a walker."""
+        stats = {}
+        large_files = []
+        large_directories = []
+        seen_large_exts = set()
+
+        for depth, dirpath, rel_path, files in walk:
+            report(rel_path)
+
+            # Analyze current directory
+            dir_stats, dir_large_files, dir_large_exts = (
+                self._analyze_single_directory(dirpath, files, depth)
+            )
+            stats[rel_path] = dir_stats
+
+            # Record large files found while analyzing the directory
+            prefix = "" if rel_path == "." else rel_path + "/"
+            for filename, size_mb in dir_large_files:
+                large_files.append((prefix + filename, size_mb))
+
+            # Check for large directories
+            if (
+                dir_stats.file_count > self.MAX_DIRECTORY_FILES
+                or dir_stats.total_size > self._max_dir_bytes
+            ):
+                size_mb = dir_stats.total_size >> 20
+                large_directories.append((rel_path, dir_stats.file_count, size_mb))
+
+            seen_large_exts |= dir_large_exts
+
+        return stats, large_files, large_directories, seen_large_exts
+
+    def _scan_directory(
+        self, path: str
+    ) -> Optional[Tuple[FileSizes, List[os.DirEntry]]]:
+        """List a directory as (files, subdirs), or None if it can't be read."""
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            # Like os.walk, never follow directory symlinks
+                            if not entry.is_symlink():
+                                subdirs.append(entry)
+                            continue
+                    except OSError:
+                        pass
+                    try:
+                        size = entry.stat(follow_symlinks=True).st_size
+                    except OSError:
+                        size = None
+                    files.append((entry.name, size))
+        except OSError:
+            return None
+        return files, subdirs
+
+    def _descend(
+        self, subdirs: List[os.DirEntry], rel_path: str, pruned: List[str]
+    ) -> List[os.DirEntry]:
+        """Return the subdirectories to recurse into, recording pruned ones."""
+        prefix = "" if rel_path == "." else rel_path + "/"
+        kept = []
+        for entry in subdirs:
+            if entry.name.lower() in self._excluded_dirnames:
+                pruned.append(prefix + entry.name)
+            else:
+                kept.append(entry)
+        return kept
+
+    def _scandir_walk(
+        self,
+        path: str,
+        rel_path: str,
+        max_depth: int,
+        pruned: List[str],
+        depth: int = 0,
+    ) -> DirWalk:
+        """
+        Yield (depth, dirpath, rel_path, file_entries) for each directory.
+
+        Relative paths are built by concatenation as the walk descends.
+        Known excluded directories are appended to `pruned` instead of scanned.
+        """
+        scan = self._scan_directory(path)
+        if scan is None:
+            return
+        files, subdirs = scan
+
+        yield depth, path, rel_path, files
+
+        if depth >= max_depth:
+            return
+        for entry in self._descend(subdirs, rel_path, pruned):
+            child_rel = entry.name if rel_path == "." else rel_path + "/" + entry.name
+            yield from self._scandir_walk(
+                entry.path, child_rel, max_depth, pruned, depth + 1
+            )
+
+    def _fast_walk(self, root_path: str, max_depth: int, pruned: List[str]) -> DirWalk:
+        """Produce the same walk as _scandir_walk using the scandir-rs backend."""
+        assert _fast_walk is not None
+        scanner = _fast_walk.Scandir(
+            root_path,
+            return_type=_fast_walk.ReturnType.Base,
+            max_depth=max_depth + 1,  # files of the deepest analyzed directories
+            skip_hidden=False,
+            follow_links=False,
+            case_sensitive=False,
+            # Known excludes are reported, but their contents are never listed
+            dir_exclude=[f"**/{name}/*" for name in self._excluded_dirnames],
+        )
 
-            except (OSError, IOError):
+        # dir_exclude only drops subdirectories, so files directly inside an
+        # excluded directory are still listed; they're filtered out below
+        dirs = ["."]
+        files: Dict[str, FileSizes] = {}
+        for entry in scanner:
+            rel_path = entry.path
+            parent, _, name = rel_path.rpartition("/")
+            if entry.is_dir:
+                if rel_path.count("/") < max_depth:
+                    if name.lower() in self._excluded_dirnames:
+                        pruned.append(rel_path)
+                    else:
+                        dirs.append(rel_path)
                 continue
 
-        avg_file_size = total_size / len(filenames) if filenames else 0
+            size = entry.st_size
+            if entry.is_symlink:
+                # Match the scandir walker: follow file links, skip dir links
+                try:
+                    st = os.stat(os.path.join(root_path, rel_path))
+                except OSError:
+                    size = None
+                else:
+                    if stat.S_ISDIR(st.st_mode):
+                        continue
+                    size = st.st_size
+            files.setdefault(parent or ".", []).append((name, size))
+
+        for rel_path in sorted(dirs):
+            if rel_path == ".":
+                depth, dirpath = 0, root_path
+            else:
+                depth = rel_path.count("/") + 1
+                dirpath = os.path.join(root_path, rel_path)
+            yield depth, dirpath, rel_path, files.get(rel_path, [])
 
-        return DirectoryStats(
+    def _analyze_single_directory(
+        self, dirpath: str, files: FileSizes, depth: int = 0
+    ) -> Tuple[DirectoryStats, List[Tuple[str, int]], Set[str]]:
+        """
+        Analyze a single directory.
+
+        Returns:
+            Directory statistics, the (filename, size_mb) of its large files
+            and the large-media extensions seen among them
+        """
+        sizes = []
+        exts = []  # one per file whose size could be read
+        large_files = []
+        large_exts = set()
+        large_ext_set = self._LARGE_EXT_SET
+
+        for name, size in files:
+            if size is None:
+                continue
+            sizes.append(size)
+            if size > self._max_file_bytes:
+                large_files.append((name, size >> 20))
+
+            # Same rules as Path.suffix
+            dot = name.rfind(".")
+            ext = name[dot:].lower() if 0 < dot < len(name) - 1 else "<no extension>"
+            exts.append(ext)
+            if ext in large_ext_set:
+                large_exts.add(ext)
+
+        # Aggregate in one C-level pass each rather than per file
+        extensions = Counter(exts)
+        total_size = sum(sizes)
+        max_file_size = max(sizes, default=0)
+        avg_file_size = total_size / len(files) if files else 0
+
+        dir_stats = DirectoryStats(
             path=dirpath,
-            file_count=len(filenames),
+            file_count=len(files),
             total_size=total_size,
             max_file_size=max_file_size,
             avg_file_size=avg_file_size,
-            extensions=dict(extensions),
-            depth=0,  # Will be set by caller
+            extensions=tuple(extensions.items()),
+            depth=depth,
         )
+        return dir_stats, large_files, large_exts
 
     def _generate_suggestions(
         self,
-        stats: Dict[str, DirectoryStats],
         large_files: List[Tuple[str, int]],
         large_directories: List[Tuple[str, int, int]],
         problematic_patterns: Set[str],
+        large_extensions: Set[str],
     ) -> Set[str]:
         """Generate smart exclude suggestions based on analysis."""
         suggestions = set()
@@ -243,10 +465,7 @@ class SmartAnalyzer:
                 suggestions.add(f"{dir_path}/")
 
         # Add patterns for file types that are commonly large
-        for stats_entry in stats.values():
-            for ext, count in stats_entry.extensions.items():
-                if ext in [".mp4", ".avi", ".mov", ".zip", ".tar.gz", ".dmg", ".iso"]:
-                    suggestions.add(f"*{ext}")
+        suggestions.update(f"*{ext}" for ext in large_extensions)
 
         # Add default exclusions
         suggestions.update(
@@ -268,6 +487,8 @@ class SmartAnalyzer:
 
     def display_analysis(self, result: AnalysisResult) -> None:
         """Display analysis results in a formatted way."""
+        from rich.table import Table
+        from rich.panel import Panel
 
         # Display summary
         self.console.print("\n📊 [bold cyan]Project Analysis Summary[/bold cyan]")
@@ -278,9 +499,9 @@ class SmartAnalyzer:
             files_table.add_column("File", style="yellow")
             files_table.add_column("Size (MB)", style="red", justify="right")
 
-            for filepath, size_mb in sorted(
-                result.large_files, key=lambda x: x[1], reverse=True
-            )[:10]:
+            for filepath, size_mb in heapq.nlargest(
+                10, result.large_files, key=lambda x: x[1]
+            ):
                 files_table.add_row(filepath, str(size_mb))
 
             self.console.print(files_table)
@@ -292,9 +513,9 @@ class SmartAnalyzer:
             dirs_table.add_column("Files", style="blue", justify="right")
             dirs_table.add_column("Size (MB)", style="red", justify="right")
 
-            for dir_path, file_count, size_mb in sorted(
-                result.large_directories, key=lambda x: x[2], reverse=True
-            )[:10]:
+            for dir_path, file_count, size_mb in heapq.nlargest(
+                10, result.large_directories, key=lambda x: x[2]
+            ):
                 dirs_table.add_row(dir_path, str(file_count), str(size_mb))
 
             self.console.print(dirs_table)
@@ -334,7 +555,7 @@ class SmartAnalyzer:
 
 
 def analyze_project_smart(
-    project_path: str, console: Optional[Console] = None
+    project_path: str, console: Optional["Console"] = None
 ) -> AnalysisResult:
     """
     Convenience function to analyze a project and return smart exclude suggestions.
@@ -12,9 +12,6 @@ from rich.text import Text
 
 from .config import CsyncConfig, find_config_file, create_gitignore_if_needed
 from .rsync import RsyncWrapper
-from .analyzer import analyze_project_smart
-from .daemon import start_daemon
-from .process_manager import get_process_manager
 
 # Create the main Typer app
 app = typer.Typer(
@@ -3,16 +3,94 @@ Configuration module for csync.
 Handles reading and parsing .csync.cfg files.
 """
 
+import copy
+import io
 import os
 import json
 import yaml
 import configparser
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    # libyaml C bindings, much faster than PyYAML's pure-Python default
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # optional speedup, see the fast-json extra
+    orjson = None
+
+
+def _json_loads(content: str) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps(data: Any) -> str:
+    """Serialize JSON with 2-space indentation, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+# Config file names, in lookup priority order
+CONFIG_NAMES = (
+    ".csync.cfg",
+    ".csync_config",
+    ".csync_config.json",
+    ".csync_config.yml",
+    ".csync_config.yaml",
+)
+_CONFIG_NAME_SET = frozenset(CONFIG_NAMES)
+
+# Parsed configs keyed by (path, cwd, mtime_ns, size). The .gitignore merge
+# is lazy and happens on each returned copy, so it needs no invalidation here
+_CONFIG_CACHE: Dict[Tuple[str, str, int, int], "CsyncConfig"] = {}
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a path, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _LazyExcludePatterns:
+    """
+    Data descriptor backing CsyncConfig.exclude_patterns.
+
+    Stores the configured patterns as given and only merges in the defaults
+    and .gitignore on first read, so commands that never look at the
+    excludes don't pay for reading .gitignore. This is also why CsyncConfig
+    isn't slotted: dataclass(slots=True) replaces the descriptor with a slot.
+    """
+
+    def __get__(
+        self, obj: Optional["CsyncConfig"], objtype: Optional[type] = None
+    ) -> Optional[List[str]]:
+        if obj is None:
+            # Dataclass field default
+            return None
+        merged = obj.__dict__.get("_exclude_patterns")
+        if merged is None:
+            merged = obj._merge_exclude_patterns()
+            obj.__dict__["_exclude_patterns"] = merged
+        return merged
+
+    def __set__(self, obj: "CsyncConfig", value: Optional[List[str]]) -> None:
+        obj.__dict__["_exclude_patterns_raw"] = value
+        obj.__dict__.pop("_exclude_patterns", None)
+
+
+@dataclass(frozen=True)
 class CsyncConfig:
     """Configuration class for csync operations."""
 
@@ -21,30 +99,38 @@ class CsyncConfig:
     remote_path: str
     ssh_user: Optional[str] = None
     ssh_port: Optional[int] = None
-    exclude_patterns: Optional[List[str]] = None
+    # Descriptor-typed field: __init__ takes Optional[List[str]] (see __set__)
+    exclude_patterns: _LazyExcludePatterns = _LazyExcludePatterns()
     rsync_options: Optional[List[str]] = None
     respect_gitignore: bool = True
 
     def __post_init__(self):
         """Validate and normalize configuration after initialization."""
+        # The dataclass is frozen, so normalized values go through
+        # object.__setattr__
+
         # Ensure local_path is absolute
-        self.local_path = os.path.abspath(os.path.expanduser(self.local_path))
+        local_path = os.path.abspath(os.path.expanduser(self.local_path))
 
         # Ensure local_path ends with /
-        if not self.local_path.endswith("/"):
-            self.local_path += "/"
+        if not local_path.endswith("/"):
+            local_path += "/"
+        object.__setattr__(self, "local_path", local_path)
 
         # Ensure remote_path ends with /
         if not self.remote_path.endswith("/"):
-            self.remote_path += "/"
+            object.__setattr__(self, "remote_path", self.remote_path + "/")
 
         # Set default rsync options if not provided
         if self.rsync_options is None:
-            self.rsync_options = ["-av", "--progress"]
+            object.__setattr__(self, "rsync_options", ["-av", "--progress"])
 
+    def _merge_exclude_patterns(self) -> List[str]:
+        """Build the effective exclude patterns from config and .gitignore."""
         # Set default exclude patterns if not provided
-        if self.exclude_patterns is None:
-            self.exclude_patterns = [
+        exclude_patterns = self.__dict__.get("_exclude_patterns_raw")
+        if exclude_patterns is None:
+            exclude_patterns = [
                 ".git/",
                 "__pycache__/",
                 "*.pyc",
@@ -58,32 +144,23 @@ class CsyncConfig:
 
         # Add gitignore patterns if respect_gitignore is True
         if self.respect_gitignore:
-            gitignore_patterns = self._load_gitignore_patterns()
-            if gitignore_patterns:
-                # Avoid duplicates
-                for pattern in gitignore_patterns:
-                    if pattern not in self.exclude_patterns:
-                        self.exclude_patterns.append(pattern)
+            exclude_patterns = exclude_patterns + self._load_gitignore_patterns()
+
+        # Avoid duplicates in one linear pass, keeping first-seen order
+        return list(dict.fromkeys(exclude_patterns))
 
     def _load_gitignore_patterns(self) -> List[str]:
         """Load patterns from .gitignore file if it exists."""
         gitignore_path = Path(self.local_path) / ".gitignore"
-        if not gitignore_path.exists():
+        try:
+            text = gitignore_path.read_text()
+        except (OSError, UnicodeDecodeError):
+            # Missing or unreadable gitignore, just continue
             return []
 
-        patterns = []
-        try:
-            with open(gitignore_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if line and not line.startswith("#"):
-                        patterns.append(line)
-        except Exception:
-            # If we can't read gitignore, just continue
-            pass
-
-        return patterns
+        # Skip empty lines and comments
+        lines = (line.strip() for line in text.splitlines())
+        return [line for line in lines if line and not line.startswith("#")]
 
     @property
     def remote_target(self) -> str:
@@ -93,20 +170,48 @@ class CsyncConfig:
         return f"{self.remote_host}:{self.remote_path}"
 
     @classmethod
-    def from_file(cls, config_path: str = ".csync.cfg") -> "CsyncConfig":
-        """Load configuration from a file."""
-        config_file = Path(config_path)
+    def invalidate_cache(cls) -> None:
+        """Forget all configs cached by from_file."""
+        _CONFIG_CACHE.clear()
 
-        if not config_file.exists():
+    @classmethod
+    def from_file(cls, config_path: str = ".csync.cfg") -> "CsyncConfig":
+        """
+        Load configuration from a file.
+
+        Parsed configs are cached and reused until the config file changes
+        on disk. .gitignore is read when exclude_patterns is first used.
+        """
+        signature = _stat_signature(config_path)
+        if signature is None:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
+        # Relative local paths resolve against the cwd, so it's part of the key
+        key = (os.path.abspath(config_path), os.getcwd(), *signature)
+        cached = _CONFIG_CACHE.get(key)
+        if cached is not None:
+            # Frozen, but the list fields are still mutable
+            return copy.deepcopy(cached)
+
+        config = cls._parse_file(config_path)
+        # Drop entries for older versions of the same file
+        for stale in [k for k in _CONFIG_CACHE if k[:2] == key[:2]]:
+            del _CONFIG_CACHE[stale]
+        _CONFIG_CACHE[key] = config
+        return copy.deepcopy(config)
+
+    @classmethod
+    def _parse_file(cls, config_path: str) -> "CsyncConfig":
+        """Read and parse a configuration file, bypassing the cache."""
+        config_file = Path(config_path)
+
         # Determine file format based on extension
         content = config_file.read_text()
 
         if config_path.endswith((".yml", ".yaml")):
-            config_data = yaml.safe_load(content)
+            config_data = yaml.load(content, Loader=_YamlLoader)
         elif config_path.endswith(".json"):
-            config_data = json.loads(content)
+            config_data = _json_loads(content)
         elif config_path.endswith(".cfg") or config_path.endswith(".ini"):
             # Parse INI/CFG format
             config = configparser.ConfigParser()
@@ -145,10 +250,11 @@ class CsyncConfig:
         else:
             # Try to parse as JSON first, then YAML
             try:
-                config_data = json.loads(content)
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                config_data = _json_loads(content)
             except json.JSONDecodeError:
                 try:
-                    config_data = yaml.safe_load(content)
+                    config_data = yaml.load(content, Loader=_YamlLoader)
                 except yaml.YAMLError as e:
                     raise ValueError(f"Unable to parse config file {config_path}: {e}")
 
@@ -172,16 +278,12 @@ class CsyncConfig:
         # Remove None values
         config_data = {k: v for k, v in config_data.items() if v is not None}
 
-        config_file = Path(config_path)
-
         if config_path.endswith((".yml", ".yaml")):
-            content = yaml.dump(config_data, default_flow_style=False)
-            with open(config_file, "w") as f:
-                f.write(content)
+            content = yaml.dump(
+                config_data, Dumper=_YamlDumper, default_flow_style=False
+            )
         elif config_path.endswith(".json"):
-            content = json.dumps(config_data, indent=2)
-            with open(config_file, "w") as f:
-                f.write(content)
+            content = _json_dumps(config_data)
         elif config_path.endswith(".cfg") or config_path.endswith(".ini"):
             # Write as INI/CFG format
             config = configparser.ConfigParser()
@@ -196,17 +298,16 @@ class CsyncConfig:
                 elif value is not None:
                     config.set("csync", key, str(value))
 
-            with open(config_file, "w") as f:
-                config.write(f)
-
-            # Read back the content for display
-            content = config_file.read_text()
+            # Render into memory so the content can be returned without
+            # reading the file back
+            buffer = io.StringIO()
+            config.write(buffer)
+            content = buffer.getvalue()
         else:
             # Default to JSON
-            content = json.dumps(config_data, indent=2)
-            with open(config_file, "w") as f:
-                f.write(content)
+            content = _json_dumps(config_data)
 
+        Path(config_path).write_text(content)
         return content
 
 
@@ -299,19 +400,18 @@ def find_config_file(start_path: str = ".") -> Optional[str]:
         Path to config file if found, None otherwise
     """
     current_path = Path(start_path).resolve()
-    config_names = [
-        ".csync.cfg",
-        ".csync_config",
-        ".csync_config.json",
-        ".csync_config.yml",
-        ".csync_config.yaml",
-    ]
-
-    while current_path != current_path.parent:  # Not at filesystem root
-        for config_name in config_names:
-            config_file = current_path / config_name
-            if config_file.exists():
-                return str(config_file)
-        current_path = current_path.parent
+
+    # The start directory and its ancestors, excluding the filesystem root
+    for directory in [current_path, *current_path.parents][:-1]:
+        # One directory listing per level instead of a stat per candidate
+        try:
+            with os.scandir(directory) as it:
+                found = {entry.name for entry in it if entry.name in _CONFIG_NAME_SET}
+        except OSError:
+            continue
+
+        for config_name in CONFIG_NAMES:
+            if config_name in found:
+                return str(directory / config_name)
 
     return None
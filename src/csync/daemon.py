@@ -3,50 +3,118 @@ Daemon module for csync.
 Implements background file watching and automatic synchronization.
 """
 
+import atexit
 import fnmatch
+import heapq
 import os
+import re
 import sys
 import time
 import threading
 from os import PathLike
 from pathlib import Path
-from typing import Optional, Set, Union
+from typing import Dict, List, Optional, Set, Union
 
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
+from watchdog.events import (
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEventHandler,
+    FileSystemEvent,
+)
 from rich.console import Console
 
 from .config import CsyncConfig
 from .rsync import RsyncWrapper
+from .ssh import SshControlMaster
 from .process_manager import DaemonInfo, ProcessManager
 
 RawPath = Union[str, bytes, PathLike[str]]
 
+# Only these events are requested from the OS watcher (the inotify mask is
+# built from this list); open/close-without-write events never reach Python
+WATCHED_EVENTS = [FileCreatedEvent, FileModifiedEvent, FileDeletedEvent, FileMovedEvent]
+
 
 class CsyncFileHandler(FileSystemEventHandler):
     """File system event handler for csync daemon."""
 
+    # Repeated modify events for a path within this window are dropped
+    DEBOUNCE_INTERVAL = 0.05
+    MAX_TRACKED_PATHS = 4096
+
     def __init__(self, daemon: "CsyncDaemon"):
         self.daemon = daemon
         self.console = daemon.console
+        # Last modify event time per path; only touched by the observer thread
+        self._last_modified: Dict[str, float] = {}
+
+    def _is_duplicate_modify(self, path: str) -> bool:
+        """
+        Check if a modify event repeats one accepted moments ago.
+
+        Only accepted events are timestamped, so a long write burst still
+        lets one event through per interval and keeps pushing the sync
+        deadline back. An event is never dropped while its path isn't
+        pending, e.g. right after a sync drained the batch.
+        """
+        now = time.monotonic()
+        last = self._last_modified.get(path)
+        if (
+            last is not None
+            and now - last < self.DEBOUNCE_INTERVAL
+            # Unlocked membership test; if a sync drains the set meanwhile,
+            # its rsync still runs after this write
+            and path in self.daemon.pending_changes
+        ):
+            return True
+
+        self._last_modified[path] = now
+        if len(self._last_modified) > self.MAX_TRACKED_PATHS:
+            self._last_modified = {
+                p: t
+                for p, t in self._last_modified.items()
+                if now - t < self.DEBOUNCE_INTERVAL
+            }
+        return False
 
     def on_any_event(self, event: FileSystemEvent) -> None:
         """Handle any file system event."""
         if event.is_directory:
             return
 
-        src_path = os.fsdecode(event.src_path)
+        self._handle_path(event.src_path, event.event_type)
+        if isinstance(event, FileMovedEvent):
+            # Atomic saves write a temp file and rename it over the target,
+            # so the destination is the path whose content changed
+            self._handle_path(event.dest_path, event.event_type)
+
+    def _handle_path(self, raw_path: Union[str, bytes], event_type: str) -> None:
+        """Filter one path of an event and queue it for sync."""
+        src_path = os.fsdecode(raw_path)
+        # Cheap prefix test on the raw path rejects most build/VCS noise
+        # (.git/, node_modules/, ...) before any normalization work
+        if src_path.startswith(self.daemon._fast_reject_prefixes):
+            return
+
         normalized_path = self.daemon._coerce_path(src_path)
 
         # Skip excluded files
-        if self.daemon.should_exclude_file(normalized_path):
+        if self.daemon._exclude_normalized(normalized_path):
+            return
+
+        # Writers emit a burst of modify events per file
+        if event_type == "modified" and self._is_duplicate_modify(normalized_path):
             return
 
-        # Add to pending changes
-        self.daemon.add_pending_change(normalized_path)
+        # Add to pending changes; rsync sends the final content of a path that
+        # is already pending (e.g. just created), so only log new entries
+        if not self.daemon._add_normalized(normalized_path):
+            return
 
         # Log the event
-        event_type = event.event_type
         rel_path = self.daemon._relative_path(normalized_path)
         self.console.print(f"📝 {event_type}: {rel_path}", style="dim")
 
@@ -60,133 +128,201 @@ class CsyncDaemon:
         self.rsync_wrapper = RsyncWrapper(config)
         self.process_manager = ProcessManager(console)
         self.local_path = Path(self.config.local_path).resolve()
+        # String prefix of the daemon root; event paths are handled as str
+        self._local_str = str(self.local_path).rstrip("/") + "/"
 
         # Daemon state
         self.observer = Observer()
         self.is_running = False
-        self.pending_changes: Set[Path] = set()
-        self.last_sync_time = 0.0
+        self.pending_changes: Set[str] = set()
+        self.last_sync_time = 0.0  # wall clock, reported in daemon stats
         self.sync_count = 0
         self.sync_lock = threading.Lock()
+        # Wakes the sync loop; scheduling uses the monotonic clock
+        self._change_cv = threading.Condition(self.sync_lock)
+        self._last_change_time = 0.0
+        # Last full-tree push; incremental pushes don't count, so deletes and
+        # missed events are still reconciled every max_sync_interval
+        self._last_full_sync = time.monotonic()
 
         # Configuration
         self.sync_delay = 5.0  # Wait 5 seconds after last change before syncing
-        self.max_sync_interval = 300.0  # Force sync every 5 minutes
+        self.max_sync_interval = 300.0  # Force a full sync every 5 minutes
         self.batch_size = 100  # Max files to sync in one batch
 
         # Generate daemon signature
         self.signature = self.process_manager.generate_signature(str(self.local_path))
+        self.control_master = SshControlMaster(
+            config,
+            str(self.process_manager.daemon_dir.parent / f"cm-{self.signature}.sock"),
+        )
 
-    def _coerce_path(self, file_path: RawPath) -> Path:
-        """Normalize incoming raw paths to absolute Path objects."""
-        if isinstance(file_path, Path):
-            path = file_path
-        else:
-            decoded = os.fsdecode(file_path)
-            path = Path(decoded)
-        if not path.is_absolute():
-            path = (self.local_path / path).resolve()
-        else:
-            path = path.resolve()
+        self._compile_exclude_patterns(self.config.exclude_patterns or [])
+
+    def _compile_exclude_patterns(self, patterns: List[str]) -> None:
+        """Precompile exclude patterns so each event check is a few C calls."""
+        dir_prefixes = []
+        exact = set()
+        wildcards = []
+        for pattern in patterns:
+            normalized = pattern.replace("\\", "/")
+            if normalized.endswith("/"):
+                dir_prefixes.append(normalized.rstrip("/") + "/")
+            elif "*" in normalized:
+                wildcards.append(f"(?:{fnmatch.translate(normalized)})")
+            else:
+                exact.add(normalized)
+
+        self._dir_prefixes = tuple(dir_prefixes)
+        # Absolute forms of the directory patterns, for raw event paths
+        self._fast_reject_prefixes = tuple(self._local_str + p for p in dir_prefixes)
+        self._exact_patterns = frozenset(exact)
+        self._wildcard_re = re.compile("|".join(wildcards)) if wildcards else None
+
+    def _coerce_path(self, file_path: RawPath) -> str:
+        """Normalize incoming raw paths to absolute path strings."""
+        path = os.fsdecode(file_path)
+        if not os.path.isabs(path):
+            path = self._local_str + path
+        # Pure string normalization; only paths outside the root (e.g. reached
+        # through a symlinked spelling) pay for a realpath() lookup
+        path = os.path.normpath(path)
+        if not path.startswith(self._local_str):
+            path = os.path.realpath(path)
         return path
 
-    def _relative_path(self, path: Path) -> str:
+    def _relative_path(self, path: str) -> str:
         """Return a forward-slash relative path to the daemon root."""
-        try:
-            return path.relative_to(self.local_path).as_posix()
-        except ValueError:
-            return os.path.relpath(str(path), str(self.local_path)).replace(os.sep, "/")
+        if path.startswith(self._local_str):
+            return path[len(self._local_str) :]
+        return os.path.relpath(path, self._local_str).replace(os.sep, "/")
 
     def should_exclude_file(self, file_path: RawPath) -> bool:
         """Check if a file should be excluded from sync."""
-        path = self._coerce_path(file_path)
+        return self._exclude_normalized(self._coerce_path(file_path))
+
+    def _exclude_normalized(self, path: str) -> bool:
+        """should_exclude_file for a path already passed through _coerce_path."""
         rel_path = self._relative_path(path)
 
-        if not self.config.exclude_patterns:
-            return False
+        # Directory patterns
+        if rel_path.startswith(self._dir_prefixes):
+            return True
 
-        for pattern in self.config.exclude_patterns:
-            # Simple pattern matching
-            normalized_pattern = pattern.replace("\\", "/")
+        # Exact matches
+        name = os.path.basename(path)
+        if rel_path in self._exact_patterns or name in self._exact_patterns:
+            return True
 
-            if normalized_pattern.endswith("/"):
-                # Directory pattern
-                if rel_path.startswith(normalized_pattern.rstrip("/")):
-                    return True
-            elif "*" in normalized_pattern:
-                # Wildcard pattern
-                if fnmatch.fnmatch(rel_path, normalized_pattern) or fnmatch.fnmatch(
-                    path.name, normalized_pattern
-                ):
-                    return True
-            else:
-                # Exact match
-                if rel_path == normalized_pattern or path.name == normalized_pattern:
-                    return True
+        # Wildcard patterns
+        if self._wildcard_re is not None:
+            match = self._wildcard_re.match
+            return match(rel_path) is not None or match(name) is not None
 
         return False
 
-    def add_pending_change(self, file_path: RawPath) -> None:
-        """Add a file to pending changes."""
-        path = self._coerce_path(file_path)
-        with self.sync_lock:
-            self.pending_changes.add(path)
+    def add_pending_change(self, file_path: RawPath) -> bool:
+        """Add a file to pending changes. Returns False if already pending."""
+        return self._add_normalized(self._coerce_path(file_path))
 
-    def get_pending_changes(self) -> Set[Path]:
+    def _add_normalized(self, path: str) -> bool:
+        """add_pending_change for a path already passed through _coerce_path."""
+        with self._change_cv:
+            was_idle = not self.pending_changes
+            is_new = path not in self.pending_changes
+            self.pending_changes.add(path)
+            self._last_change_time = time.monotonic()
+            # Later changes only push the deadline back, so only the first
+            # change of a batch needs to wake the sync loop
+            if was_idle:
+                self._change_cv.notify()
+            return is_new
+
+    def get_pending_changes(self) -> Set[str]:
         """Get and clear pending changes."""
         with self.sync_lock:
             changes = self.pending_changes.copy()
             self.pending_changes.clear()
             return changes
 
+    def _next_sync_deadline(self) -> float:
+        """Monotonic time the next sync is due. Caller must hold sync_lock."""
+        # Force a full sync once max interval is exceeded
+        deadline = self._last_full_sync + self.max_sync_interval
+
+        # Sync pending changes once they have been quiet for sync_delay
+        if self.pending_changes:
+            deadline = min(deadline, self._last_change_time + self.sync_delay)
+
+        return deadline
+
     def should_sync_now(self) -> bool:
         """Determine if we should sync now based on timing and changes."""
-        current_time = time.time()
+        with self.sync_lock:
+            return time.monotonic() >= self._next_sync_deadline()
 
-        # Force sync if max interval exceeded
-        if current_time - self.last_sync_time > self.max_sync_interval:
-            return True
+    def _incremental_sync_paths(self, changes: Set[str]) -> Optional[List[str]]:
+        """
+        Return relative paths to push with --files-from, or None if a full
+        tree push is needed instead.
 
-        # Sync if we have pending changes and delay has passed
-        if (
-            self.pending_changes
-            and current_time - self.last_sync_time > self.sync_delay
-        ):
-            return True
+        rsync can't be handed deleted files or paths outside the root, and a
+        large batch is cheaper as a normal tree walk.
+        """
+        if not changes or len(changes) > self.batch_size:
+            return None
 
-        return False
+        rel_paths = []
+        for change in changes:
+            rel_path = self._relative_path(change)
+            if rel_path.startswith("../") or not os.path.lexists(change):
+                return None
+            rel_paths.append(rel_path)
+        return rel_paths
 
     def perform_sync(self) -> bool:
         """Perform synchronization."""
         try:
             # Get pending changes
             changes = self.get_pending_changes()
+            now = time.monotonic()
 
             if changes:
                 change_count = len(changes)
-                display_changes = sorted(changes, key=lambda p: p.as_posix())
+                # Only a few paths are shown, so avoid sorting the whole batch
+                display_changes = heapq.nsmallest(
+                    5 if change_count <= 5 else 3, changes
+                )
                 self.console.print(
                     f"🔄 Syncing {change_count} changes...", style="blue"
                 )
 
                 # Show some of the changed files
-                if change_count <= 5:
-                    for change in display_changes[:5]:
-                        rel_path = self._relative_path(change)
-                        self.console.print(f"  • {rel_path}", style="dim")
-                else:
-                    shown_changes = display_changes[:3]
-                    for change in shown_changes:
-                        rel_path = self._relative_path(change)
-                        self.console.print(f"  • {rel_path}", style="dim")
+                for change in display_changes:
+                    rel_path = self._relative_path(change)
+                    self.console.print(f"  • {rel_path}", style="dim")
+                if change_count > 5:
                     self.console.print(
-                        f"  ... and {change_count - 3} more files", style="dim"
+                        f"  ... and {change_count - len(display_changes)} more files",
+                        style="dim",
                     )
             else:
                 self.console.print("🔄 Performing scheduled sync...", style="blue")
 
-            # Perform the actual sync
-            success = self.rsync_wrapper.push(dry_run=False, verbose=False)
+            # Perform the actual sync; a due full sync wins even with changes
+            rel_paths = None
+            if now - self._last_full_sync < self.max_sync_interval:
+                rel_paths = self._incremental_sync_paths(changes)
+            if rel_paths:
+                success = self.rsync_wrapper.push_files(
+                    rel_paths, verbose=False, quiet=True
+                )
+            else:
+                # Counted as an attempt, so a failing push isn't retried at once
+                self._last_full_sync = now
+                success = self.rsync_wrapper.push(
+                    dry_run=False, verbose=False, quiet=True
+                )
 
             if success:
                 self.sync_count += 1
@@ -211,12 +347,17 @@ class CsyncDaemon:
         """Main sync loop running in background thread."""
         while self.is_running:
             try:
-                if self.should_sync_now():
+                # Sleep until the next deadline or until a change/stop wakes us
+                with self._change_cv:
+                    while self.is_running:
+                        timeout = self._next_sync_deadline() - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        self._change_cv.wait(timeout)
+
+                if self.is_running:
                     self.perform_sync()
 
-                # Sleep for a short interval
-                time.sleep(1.0)
-
             except Exception as e:
                 self.console.print(f"❌ Daemon error: {e}", style="red")
                 time.sleep(5.0)  # Wait longer on error
@@ -242,7 +383,12 @@ class CsyncDaemon:
 
         # Setup file watching
         event_handler = CsyncFileHandler(self)
-        self.observer.schedule(event_handler, str(self.local_path), recursive=True)
+        self.observer.schedule(
+            event_handler,
+            str(self.local_path),
+            recursive=True,
+            event_filter=WATCHED_EVENTS,
+        )
 
         # Create daemon info
         daemon_info = DaemonInfo(
@@ -267,6 +413,7 @@ class CsyncDaemon:
 
                 # Child process continues as daemon
                 os.setsid()  # Create new session
+                os.chdir("/")  # Don't keep the launch directory busy
 
                 # Update PID in daemon info
                 daemon_info.pid = os.getpid()
@@ -287,6 +434,17 @@ class CsyncDaemon:
         # Set up signal handlers
         self.process_manager.setup_signal_handlers(self.signature)
 
+        # Open one SSH connection up front so each rsync skips the handshake
+        if self.control_master.start():
+            self.rsync_wrapper.use_control_master(self.control_master)
+            # Signal handlers exit without calling stop()
+            atexit.register(self.control_master.stop)
+        else:
+            self.console.print(
+                "⚠️  Could not open a shared SSH connection, using one per sync",
+                style="yellow",
+            )
+
         # Start file observer
         self.observer.start()
         self.is_running = True
@@ -305,9 +463,15 @@ class CsyncDaemon:
         self.perform_sync()
 
         if detach:
-            # Redirect output for daemon
-            sys.stdout.close()
-            sys.stderr.close()
+            # Redirect output for daemon. Point fds 0-2 at /dev/null rather
+            # than closing them, so rsync and late console writes don't hit
+            # EBADF (or a reused fd)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            devnull_fd = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull_fd, fd)
+            os.close(devnull_fd)
 
             # Keep daemon running
             try:
@@ -328,12 +492,17 @@ class CsyncDaemon:
 
     def stop(self) -> None:
         """Stop the daemon."""
-        self.is_running = False
+        with self._change_cv:
+            self.is_running = False
+            self._change_cv.notify_all()
 
         if self.observer.is_alive():
             self.observer.stop()
             self.observer.join()
 
+        self.rsync_wrapper.use_control_master(None)
+        self.control_master.stop()
+
         # Clean up daemon files
         self.process_manager.cleanup_daemon_files(self.signature)
 
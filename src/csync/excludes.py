@@ -0,0 +1,48 @@
+"""
+Exclude file module for csync.
+Writes exclude patterns to a file that rsync reads with --exclude-from.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import List, Optional
+
+
+class ExcludeFile:
+    """
+    A --exclude-from file for a fixed list of patterns.
+
+    Files live in ~/.csync/excludes/ and are named after a hash of their
+    content, so every process with the same patterns shares one file and
+    nothing has to be cleaned up at exit. The file is recreated whenever it
+    has gone missing, so a long-running daemon survives it being removed.
+    """
+
+    def __init__(self, patterns: List[str], directory: Optional[Path] = None):
+        """
+        Initialize the exclude file for a list of patterns.
+
+        Args:
+            patterns: Exclude patterns, one per line in the file
+            directory: Where to keep the file, defaults to ~/.csync/excludes
+        """
+        self.content = "".join(f"{pattern}\n" for pattern in patterns)
+        digest = hashlib.md5(self.content.encode()).hexdigest()[:16]
+        directory = directory or Path.home() / ".csync" / "excludes"
+        self.path = str(directory / f"{digest}.txt")
+
+    def ensure(self) -> str:
+        """Write the file if it doesn't exist and return its path."""
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Write then rename, so a concurrent rsync never reads half a file
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(self.content)
+            os.replace(tmp_path, self.path)
+        return self.path
+
+    def rsync_args(self) -> List[str]:
+        """Get the --exclude-from argument, writing the file if needed."""
+        return [f"--exclude-from={self.ensure()}"]
@@ -0,0 +1,63 @@
+"""
+Quiet rsync profile for csync.
+Turns the configured rsync options into ones without per-file output, for
+background syncs.
+"""
+
+import functools
+import re
+import subprocess
+from typing import List
+
+# Replaces per-file output in quiet runs; errors still go to stderr.
+# --info needs rsync 3.1+, older ones (e.g. macOS's 2.6.9) get -q instead
+QUIET_INFO_FLAGS = "--info=stats2,flist0,progress0"
+
+# Short options that take a value, which may be attached (-T/var/tmp)
+_SHORT_OPTIONS_WITH_VALUE = frozenset("BeTfM@")
+
+
+@functools.lru_cache(maxsize=None)
+def rsync_supports_info() -> bool:
+    """Check once whether the installed rsync understands --info (3.1+)."""
+    try:
+        result = subprocess.run(
+            ["rsync", "--version"], capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return False
+    # openrsync reports "rsync version 2.6.9 compatible"
+    match = re.search(r"version (\d+)\.(\d+)", result.stdout)
+    return match is not None and (int(match[1]), int(match[2])) >= (3, 1)
+
+
+def quiet_options(options: List[str]) -> List[str]:
+    """
+    Strip verbosity and progress from rsync options.
+
+    Short flag clusters lose their "v" (e.g. -av becomes -a), and the
+    per-file output is replaced by QUIET_INFO_FLAGS, or -q on rsync
+    versions without --info.
+    """
+    quiet = []
+    for option in options:
+        if option in ("-v", "--verbose", "--progress"):
+            continue
+        if option == "-P":
+            # -P is --partial --progress
+            quiet.append("--partial")
+        elif option.startswith("-") and not option.startswith("--"):
+            flags = option[1:]
+            value = ""
+            # Anything after a value-taking option is its value, not flags
+            for i, flag in enumerate(flags):
+                if flag in _SHORT_OPTIONS_WITH_VALUE:
+                    flags, value = flags[: i + 1], flags[i + 1 :]
+                    break
+            flags = flags.replace("v", "")
+            if flags:
+                quiet.append(f"-{flags}{value}")
+        else:
+            quiet.append(option)
+    quiet.append(QUIET_INFO_FLAGS if rsync_supports_info() else "-q")
+    return quiet
@@ -6,25 +6,52 @@ Provides functionality to sync files between local and remote machines using rsy
 import subprocess
 import sys
 import os
-from typing import List
+from typing import Iterable, List, Optional
 
 from .config import CsyncConfig
+from .excludes import ExcludeFile
+from .quiet import quiet_options
+from .ssh import SshControlMaster, remote_shell_args
 
 
 class RsyncWrapper:
     """A wrapper class for rsync operations."""
 
-    def __init__(self, config: CsyncConfig):
+    def __init__(
+        self,
+        config: CsyncConfig,
+        control_master: Optional[SshControlMaster] = None,
+    ):
         """
         Initialize the RsyncWrapper with a configuration.
 
         Args:
             config: CsyncConfig instance with sync settings
+            control_master: Optional SSH master connection to reuse
         """
         self.config = config
 
+        # The config is frozen, so the static parts of every command are
+        # built once here instead of on each sync
+        options = config.rsync_options or []
+        self._base_cmd = ["rsync", *options]
+        # Built on first quiet run, since it depends on the rsync version
+        self._quiet_base_cmd: Optional[List[str]] = None
+        patterns = config.exclude_patterns
+        self._exclude_file = ExcludeFile(patterns) if patterns else None
+        self.use_control_master(control_master)
+
+    def use_control_master(self, control_master: Optional[SshControlMaster]) -> None:
+        """Route rsync's ssh through a master connection, or stop doing so."""
+        self._ssh_args = remote_shell_args(self.config, control_master)
+
     def _build_rsync_command(
-        self, source: str, destination: str, dry_run: bool = False
+        self,
+        source: str,
+        destination: str,
+        dry_run: bool = False,
+        files_from_stdin: bool = False,
+        quiet: bool = False,
     ) -> List[str]:
         """
         Build the rsync command with appropriate options.
@@ -33,36 +60,44 @@ class RsyncWrapper:
             source: Source path
             destination: Destination path
             dry_run: If True, add --dry-run flag
+            files_from_stdin: If True, read the file list from stdin
+            quiet: If True, drop verbose/progress options
 
         Returns:
             List of command arguments for subprocess
         """
-        cmd = ["rsync"] + (
-            self.config.rsync_options.copy() if self.config.rsync_options else []
-        )
+        if quiet:
+            if self._quiet_base_cmd is None:
+                options = quiet_options(self.config.rsync_options or [])
+                self._quiet_base_cmd = ["rsync", *options]
+            cmd = self._quiet_base_cmd.copy()
+        else:
+            cmd = self._base_cmd.copy()
 
         if dry_run:
             cmd.append("--dry-run")
 
-        # Add exclude patterns
-        if self.config.exclude_patterns:
-            for pattern in self.config.exclude_patterns:
-                cmd.extend(["--exclude", pattern])
+        if files_from_stdin:
+            # Implies --relative, so paths are recreated under destination
+            cmd.append("--files-from=-")
 
-        # Add SSH options if specified
-        if self.config.ssh_port:
-            cmd.extend(["-e", f"ssh -p {self.config.ssh_port}"])
-
-        cmd.extend([source, destination])
+        # Exclude patterns and SSH options are precomputed
+        if self._exclude_file is not None:
+            cmd += self._exclude_file.rsync_args()
+        cmd += self._ssh_args
+        cmd += (source, destination)
         return cmd
 
-    def push(self, dry_run: bool = False, verbose: bool = True) -> bool:
+    def push(
+        self, dry_run: bool = False, verbose: bool = True, quiet: bool = False
+    ) -> bool:
         """
         Push (sync) local files to remote.
 
         Args:
             dry_run: If True, perform a dry run without actually copying files
             verbose: If True, print the command being executed
+            quiet: If True, run rsync without per-file output and discard stdout
 
         Returns:
             True if sync was successful, False otherwise
@@ -70,22 +105,31 @@ class RsyncWrapper:
         source = self.config.local_path
         destination = self.config.remote_target
 
-        cmd = self._build_rsync_command(source, destination, dry_run)
+        cmd = self._build_rsync_command(source, destination, dry_run, quiet=quiet)
+        return self._run(cmd, "Push", verbose, quiet=quiet)
 
-        if verbose:
-            print(f"Executing: {' '.join(cmd)}")
+    def push_files(
+        self, paths: Iterable[str], verbose: bool = True, quiet: bool = False
+    ) -> bool:
+        """
+        Push only the given files instead of walking the whole tree.
 
-        try:
-            subprocess.run(cmd, check=True, capture_output=False)
-            if verbose:
-                print("✅ Push completed successfully!")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Push failed with exit code {e.returncode}", file=sys.stderr)
-            return False
-        except FileNotFoundError:
-            print("❌ rsync command not found. Please install rsync.", file=sys.stderr)
-            return False
+        Args:
+            paths: File paths relative to the local path
+            verbose: If True, print the command being executed
+            quiet: If True, run rsync without per-file output and discard stdout
+
+        Returns:
+            True if sync was successful, False otherwise
+        """
+        source = self.config.local_path
+        destination = self.config.remote_target
+
+        cmd = self._build_rsync_command(
+            source, destination, files_from_stdin=True, quiet=quiet
+        )
+        file_list = "".join(f"{path}\n" for path in paths)
+        return self._run(cmd, "Push", verbose, quiet=quiet, input=file_list)
 
     def pull(self, dry_run: bool = False, verbose: bool = True) -> bool:
         """
@@ -105,17 +149,45 @@ class RsyncWrapper:
         os.makedirs(destination, exist_ok=True)
 
         cmd = self._build_rsync_command(source, destination, dry_run)
+        return self._run(cmd, "Pull", verbose)
+
+    def _run(
+        self,
+        cmd: List[str],
+        action: str,
+        verbose: bool,
+        quiet: bool = False,
+        input: Optional[str] = None,
+    ) -> bool:
+        """
+        Run an rsync command and report the outcome.
+
+        Args:
+            cmd: Command built by _build_rsync_command
+            action: "Push" or "Pull", used in messages
+            verbose: If True, print the command and a success message
+            quiet: If True, discard rsync's stdout
+            input: Text to send on rsync's stdin (e.g. a --files-from list)
 
+        Returns:
+            True if rsync succeeded, False otherwise
+        """
         if verbose:
             print(f"Executing: {' '.join(cmd)}")
 
         try:
-            subprocess.run(cmd, check=True, capture_output=False)
+            subprocess.run(
+                cmd,
+                check=True,
+                stdout=subprocess.DEVNULL if quiet else None,
+                input=input,
+                text=input is not None,
+            )
             if verbose:
-                print("✅ Pull completed successfully!")
+                print(f"✅ {action} completed successfully!")
             return True
         except subprocess.CalledProcessError as e:
-            print(f"❌ Pull failed with exit code {e.returncode}", file=sys.stderr)
+            print(f"❌ {action} failed with exit code {e.returncode}", file=sys.stderr)
             return False
         except FileNotFoundError:
             print("❌ rsync command not found. Please install rsync.", file=sys.stderr)
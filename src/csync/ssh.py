@@ -0,0 +1,157 @@
+"""
+SSH connection sharing module for csync.
+Keeps one OpenSSH ControlMaster connection open so repeated rsync runs skip
+the SSH handshake.
+"""
+
+import os
+import shlex
+import subprocess
+from typing import List, Optional
+
+from .config import CsyncConfig
+
+
+def ssh_host(config: CsyncConfig) -> str:
+    """Get the user@host string used for ssh."""
+    if config.ssh_user:
+        return f"{config.ssh_user}@{config.remote_host}"
+    return config.remote_host
+
+
+def ssh_options(config: CsyncConfig) -> List[str]:
+    """Get the ssh options shared by rsync and the control master."""
+    options = []
+    if config.ssh_port:
+        options.extend(["-p", str(config.ssh_port)])
+    return options
+
+
+class SshControlMaster:
+    """A background SSH master connection that rsync runs can reuse."""
+
+    # Seconds to wait for the remote host before giving up on the master
+    CONNECT_TIMEOUT = 10
+
+    def __init__(self, config: CsyncConfig, control_path: str):
+        """
+        Initialize the control master for a configuration.
+
+        Args:
+            config: CsyncConfig instance with the remote host settings
+            control_path: Path of the control socket to create
+        """
+        self.config = config
+        self.control_path = control_path
+        self.is_running = False
+
+    def client_options(self) -> List[str]:
+        """Get the ssh options that make a client reuse this master."""
+        return ["-S", shlex.quote(self.control_path), "-o", "ControlMaster=no"]
+
+    def start(self) -> bool:
+        """
+        Start the master connection in the background.
+
+        Returns:
+            True if the master is running, False otherwise
+        """
+        # A daemon that was killed leaves its master and socket behind. With
+        # the socket in place, ssh silently falls back to a plain connection
+        # that stop() could never close
+        if self._check():
+            self.is_running = True
+            return True
+        try:
+            os.unlink(self.control_path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+
+        cmd = ["ssh", "-M", "-S", self.control_path, "-N", "-f"]
+        cmd.extend(
+            ["-o", "BatchMode=yes", "-o", f"ConnectTimeout={self.CONNECT_TIMEOUT}"]
+        )
+        cmd.extend(ssh_options(self.config))
+        cmd.append(ssh_host(self.config))
+
+        try:
+            # The forked master keeps any inherited pipes open for its whole
+            # lifetime, so it must not get the caller's stdout/stderr
+            subprocess.run(
+                cmd,
+                check=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.CONNECT_TIMEOUT * 2,
+            )
+        except (
+            subprocess.CalledProcessError,
+            subprocess.TimeoutExpired,
+            FileNotFoundError,
+        ):
+            return False
+
+        self.is_running = True
+        return True
+
+    def _check(self) -> bool:
+        """Check whether a master is already listening on the socket."""
+        if not os.path.exists(self.control_path):
+            return False
+
+        cmd = ["ssh", "-S", self.control_path, "-O", "check", ssh_host(self.config)]
+        try:
+            result = subprocess.run(
+                cmd,
+                check=False,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.CONNECT_TIMEOUT,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return False
+        return result.returncode == 0
+
+    def stop(self) -> None:
+        """Shut down the master connection, if it was started."""
+        if not self.is_running:
+            return
+
+        cmd = ["ssh", "-S", self.control_path, "-O", "exit", ssh_host(self.config)]
+        try:
+            subprocess.run(
+                cmd,
+                check=False,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.CONNECT_TIMEOUT,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            pass
+        self.is_running = False
+
+
+def remote_shell_args(
+    config: CsyncConfig, control_master: Optional[SshControlMaster] = None
+) -> List[str]:
+    """
+    Get rsync's -e option for the configured ssh settings.
+
+    Args:
+        config: CsyncConfig instance with the remote host settings
+        control_master: Running master connection to reuse, if any
+
+    Returns:
+        ["-e", "<ssh command>"], or an empty list when plain ssh will do
+    """
+    options = ssh_options(config)
+    if control_master is not None and control_master.is_running:
+        options.extend(control_master.client_options())
+    if not options:
+        return []
+    return ["-e", " ".join(["ssh", *options])]